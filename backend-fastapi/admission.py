@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import math
+import re
+import time
+from fastapi.responses import JSONResponse
+
+# Sync routes run on anyio's default threadpool, which has 40 workers
+TOTAL_CAPACITY = 40
+
+
+class RouteClass:
+    """Concurrency budget for a group of routes. Lower priority value wins."""
+
+    def __init__(self, name: str, priority: int, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+
+# Writes and auth may use the whole pool, bulk listings only a slice of it
+ROUTE_CLASSES = {
+    "critical": RouteClass("critical", priority=0, limit=TOTAL_CAPACITY, max_queue=200, max_wait=5.0),
+    "standard": RouteClass("standard", priority=1, limit=24, max_queue=100, max_wait=2.0),
+    "bulk": RouteClass("bulk", priority=2, limit=12, max_queue=50, max_wait=0.5),
+}
+
+# (method, path pattern, class) - first match wins, anything else is "standard"
+ROUTE_RULES = [
+    ("POST", re.compile(r"^/login(/|$)"), "critical"),
+    ("POST", re.compile(r"^/register/"), "critical"),
+    ("POST", re.compile(r"^/appointments/request$"), "critical"),
+    ("POST", re.compile(r"^/appointments/doctor/[^/]+/accept$"), "critical"),
+    ("POST", re.compile(r"^/prescriptions/doctor$"), "critical"),
+    ("POST", re.compile(r"^/hospital-admin/(approve|reject)/"), "critical"),
+    ("GET", re.compile(r"^/hospitals(/|$)"), "bulk"),
+    ("GET", re.compile(r"^/appointments/hospitals/[^/]+/doctors$"), "bulk"),
+    ("GET", re.compile(r"^/hospital-admin/doctors$"), "bulk"),
+    ("GET", re.compile(r"^/users/doctor/"), "bulk"),
+]
+
+
+def classify(method: str, path: str) -> RouteClass:
+    for rule_method, pattern, name in ROUTE_RULES:
+        if method == rule_method and pattern.match(path):
+            return ROUTE_CLASSES[name]
+    return ROUTE_CLASSES["standard"]
+
+
+class Overloaded(Exception):
+    def __init__(self, route_class: RouteClass):
+        self.route_class = route_class
+
+
+class AdmissionController:
+    """
+    Shared concurrency limiter. Each route class has its own limit and
+    bounded wait queue; freed slots go to waiting requests by priority.
+    """
+
+    def __init__(self, capacity: int = TOTAL_CAPACITY, classes: dict = ROUTE_CLASSES):
+        self.capacity = capacity
+        self.classes = classes
+        self.inflight = 0
+        self._running = {name: 0 for name in classes}
+        self._queued = {name: 0 for name in classes}
+        self._waiters = []
+        self._seq = itertools.count()
+        self._stats = {
+            name: {"admitted": 0, "rejected": 0, "queueWaitTotalMs": 0.0, "queueWaitMaxMs": 0.0}
+            for name in classes
+        }
+
+    def _can_run(self, route_class: RouteClass) -> bool:
+        return self.inflight < self.capacity and self._running[route_class.name] < route_class.limit
+
+    def _grant(self, route_class: RouteClass):
+        self.inflight += 1
+        self._running[route_class.name] += 1
+
+    def _record(self, route_class: RouteClass, waited_ms: float):
+        stats = self._stats[route_class.name]
+        stats["admitted"] += 1
+        stats["queueWaitTotalMs"] += waited_ms
+        stats["queueWaitMaxMs"] = max(stats["queueWaitMaxMs"], waited_ms)
+
+    async def acquire(self, route_class: RouteClass) -> float:
+        """Wait for a slot and return the time spent queued in milliseconds"""
+        if self._can_run(route_class):
+            self._grant(route_class)
+            self._record(route_class, 0.0)
+            return 0.0
+
+        if self._queued[route_class.name] >= route_class.max_queue:
+            self._stats[route_class.name]["rejected"] += 1
+            raise Overloaded(route_class)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (route_class.priority, next(self._seq), route_class, future))
+        self._queued[route_class.name] += 1
+        started = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), route_class.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Slot was granted as we gave up, hand it back
+                self.release(route_class)
+            else:
+                future.cancel()
+                self._queued[route_class.name] -= 1
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._stats[route_class.name]["rejected"] += 1
+            raise Overloaded(route_class)
+
+        waited_ms = (time.perf_counter() - started) * 1000
+        self._record(route_class, waited_ms)
+        return waited_ms
+
+    def release(self, route_class: RouteClass):
+        self.inflight -= 1
+        self._running[route_class.name] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to the highest priority waiters that fit their class limit"""
+        blocked = []
+        while self._waiters and self.inflight < self.capacity:
+            entry = heapq.heappop(self._waiters)
+            route_class, future = entry[2], entry[3]
+            if future.done():
+                continue
+            if not self._can_run(route_class):
+                blocked.append(entry)
+                continue
+            self._queued[route_class.name] -= 1
+            self._grant(route_class)
+            future.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self._waiters, entry)
+
+    def snapshot(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "inflight": self.inflight,
+            "classes": {
+                name: {
+                    "running": self._running[name],
+                    "queued": self._queued[name],
+                    **self._stats[name]
+                }
+                for name in self.classes
+            }
+        }
+
+
+class AdmissionControlMiddleware:
+    """Sheds excess load with 503 + Retry-After before it reaches the threadpool"""
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+
+        try:
+            waited_ms = await self.controller.acquire(route_class)
+        except Overloaded:
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(max(1, math.ceil(route_class.max_wait)))}
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"queue;dur={waited_ms:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.controller.release(route_class)
+
+
+admission_controller = AdmissionController()
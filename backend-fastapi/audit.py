@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from config import settings
+from db import audit_col
+
+BUFFER_CAPACITY = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 1.0
+# How long a request thread may wait for buffer space before the event is dropped
+MAX_BLOCK = 0.05
+DUPLICATE_KEY = 11000
+
+
+class AuditLog:
+    """
+    Write-behind audit trail of PHI access.
+    Request threads append to a bounded in-memory buffer; a background
+    thread flushes it with insert_many whenever a batch fills up or the
+    flush interval passes, and drains whatever is left on shutdown.
+    Events get their _id when recorded, so retrying a partly written
+    batch cannot store an event twice.
+    """
+
+    def __init__(
+        self,
+        collection,
+        capacity: int = BUFFER_CAPACITY,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_block: float = MAX_BLOCK,
+        enabled: bool = True
+    ):
+        self.collection = collection
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_block = max_block
+        self.enabled = enabled
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    def record(self, actor, action: str, resource: str, patient_ids=(), **details):
+        """Queue one access event. `actor` is the decoded token payload or None."""
+        if not self.enabled:
+            return
+
+        event = {
+            "_id": ObjectId(),
+            "at": datetime.utcnow(),
+            "actorId": actor.get("user_id") if actor else None,
+            "actorRole": actor.get("role") if actor else None,
+            "action": action,
+            "resource": resource,
+            "patientIds": sorted({str(pid) for pid in patient_ids if pid}),
+            **details
+        }
+
+        with self._cond:
+            if len(self._buffer) >= self.capacity:
+                # Backpressure: wake the flusher and give it a moment to make room
+                self._cond.notify_all()
+                deadline = time.monotonic() + self.max_block
+                while len(self._buffer) >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.dropped += 1
+                        return
+                    self._cond.wait(remaining)
+
+            self._buffer.append(event)
+            self.recorded += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _take_batch(self) -> list:
+        count = min(len(self._buffer), self.batch_size)
+        return [self._buffer.popleft() for _ in range(count)]
+
+    def _flush(self, batch: list) -> bool:
+        try:
+            self.collection.insert_many(batch, ordered=False)
+            self.flushed += len(batch)
+            return True
+        except BulkWriteError as e:
+            # A duplicate key means an earlier attempt already stored that event
+            errors = [err for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY]
+            if e.details.get("writeConcernErrors"):
+                # Writes may not be durable, retrying the whole batch is safe
+                failed = batch
+                code = e.details["writeConcernErrors"][0].get("code")
+            else:
+                failed = [batch[err["index"]] for err in errors]
+                code = errors[0].get("code") if errors else None
+            self.flushed += len(batch) - len(failed)
+            if not failed:
+                return True
+            self._requeue(failed, code)
+            return False
+        except Exception as e:
+            self._requeue(batch, getattr(e, "code", None) or type(e).__name__)
+            return False
+
+    def _requeue(self, events: list, code):
+        # Error messages can echo document values, so only the code is logged
+        print(f"Audit flush error: code={code} events={len(events)}")
+        self.failed_flushes += 1
+        with self._cond:
+            # Put the events back for the next attempt, as far as space allows
+            room = max(0, self.capacity - len(self._buffer))
+            self.dropped += len(events) - min(room, len(events))
+            self._buffer.extendleft(reversed(events[:room]))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or len(self._buffer) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                batch = self._take_batch()
+                stopping = self._stopping
+                # Space was freed, release any request threads under backpressure
+                self._cond.notify_all()
+
+            if not batch:
+                if stopping:
+                    return
+                continue
+
+            if not self._flush(batch):
+                if stopping:
+                    # Database is unavailable at shutdown, give up on the rest
+                    with self._cond:
+                        self.dropped += len(self._buffer)
+                        self._buffer.clear()
+                    return
+                time.sleep(self.flush_interval)
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything still buffered, then stop the background thread"""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "capacity": self.capacity,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failedFlushes": self.failed_flushes
+        }
+
+
+audit_log = AuditLog(audit_col, enabled=settings.audit_enabled)
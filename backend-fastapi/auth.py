@@ -1,13 +1,11 @@
-import os
 from datetime import datetime, timedelta
 from jose import jwt
-from dotenv import load_dotenv
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
-load_dotenv()
+from config import settings
 
-SECRET_KEY = os.getenv("JWT_SECRET")
+SECRET_KEY = settings.jwt_secret
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480
 
@@ -0,0 +1,105 @@
+import gzip
+
+import brotli
+
+MINIMUM_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+
+def _accepted_encodings(scope) -> dict:
+    """Content-coding -> q value from Accept-Encoding; a malformed q counts as 0"""
+    codings = {}
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            for part in value.decode("latin-1").lower().split(","):
+                coding, *params = [p.strip() for p in part.split(";")]
+                q = 1.0
+                for param in params:
+                    key, _, raw = param.partition("=")
+                    if key.strip() == "q":
+                        try:
+                            q = float(raw)
+                        except ValueError:
+                            q = 0.0
+                if coding:
+                    codings[coding] = q
+    return codings
+
+
+def choose_encoding(scope):
+    codings = _accepted_encodings(scope)
+    # Codings not listed fall back to "*"; q=0 in any form means not acceptable
+    wildcard = codings.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if codings.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    Compresses single-part responses of at least MINIMUM_SIZE bytes with
+    brotli or gzip, whichever the client accepts (brotli preferred).
+    Streaming responses and already-encoded bodies pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Hold the headers until we know the body size
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = [(k, v) for k, v in start.get("headers", []) if k != b"content-length"]
+            already_encoded = any(k == b"content-encoding" for k, _ in headers)
+
+            if message.get("more_body", False) or already_encoded or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,20 @@
+import os
+import pytz
+from dotenv import load_dotenv
+
+
+class Settings:
+    """Environment configuration, read once per process"""
+
+    def __init__(self):
+        load_dotenv()  # load .env file
+        self.mongo_uri = os.getenv("MONGO_URI")
+        self.mongo_db = os.getenv("MONGO_DB", "ehealth")
+        self.jwt_secret = os.getenv("JWT_SECRET")
+        self.audit_enabled = os.getenv("AUDIT_ENABLED", "true").lower() != "false"
+
+
+settings = Settings()
+
+# Shared by every route that stamps or converts times
+IST = pytz.timezone("Asia/Kolkata")
@@ -1,21 +1,12 @@
-import os
-from dotenv import load_dotenv
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
+from config import settings
 
-load_dotenv()  # load .env file
+# connect=False defers all I/O, including SRV lookups for mongodb+srv:// URIs,
+# to the first operation. The ping and index builds run from the app lifespan via init_db().
+client = MongoClient(settings.mongo_uri, server_api=ServerApi('1'), connect=False)
 
-uri = os.getenv("MONGO_URI")
-
-client = MongoClient(uri, server_api=ServerApi('1'))
-
-try:
-    client.admin.command('ping')
-    print("MongoDB connected successfully!")
-except Exception as e:
-    print("MongoDB connection error:", e)
-
-db = client["ehealth"]
+db = client[settings.mongo_db]
 
 ##------------------- Hospitals -------------------##
 
@@ -30,3 +21,47 @@ users_col = db["users"]
 ehr_col = db["ehr_records"]
 prescriptions_col = db["prescriptions"]
 appointments_col = db["appointments"]
+
+##------------------ Idempotency --------------------##
+
+idempotency_col = db["idempotency"]
+
+##------------------ Audit --------------------##
+
+audit_col = db["audit_log"]
+
+##------------------ Lifecycle --------------------##
+
+def init_db():
+    try:
+        client.admin.command('ping')
+        print("MongoDB connected successfully!")
+    except Exception as e:
+        print("MongoDB connection error:", e)
+
+    try:
+        # Doctor-side prescription search: free text, medicine name and date range,
+        # all led by doctorId so a search only touches that doctor's entries
+        prescriptions_col.create_index(
+            [("doctorId", 1), ("diagnosis", "text"), ("notes", "text")],
+            name="prescription_doctor_text"
+        )
+        prescriptions_col.create_index([("doctorId", 1), ("medicines.nameLower", 1)])
+        prescriptions_col.create_index([("doctorId", 1), ("createdAt", -1)])
+    except Exception as e:
+        print("Prescription index error:", e)
+
+    try:
+        # Stored responses expire on their own once clients have stopped retrying
+        idempotency_col.create_index("createdAt", expireAfterSeconds=24 * 60 * 60)
+    except Exception as e:
+        print("Idempotency index error:", e)
+
+    try:
+        # "Who accessed this patient's records" is the main audit query
+        audit_col.create_index([("patientIds", 1), ("at", -1)])
+    except Exception as e:
+        print("Audit index error:", e)
+
+def close_db():
+    client.close()
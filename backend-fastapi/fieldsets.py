@@ -0,0 +1,43 @@
+from typing import Optional
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+def model_fields(model) -> list:
+    """Output names of a response model's fields, in declaration order"""
+    return [field.alias or name for name, field in model.model_fields.items()]
+
+
+def select_fields(fields: Optional[str], allowed, default) -> list:
+    """
+    Parse a comma-separated `fields=` query value against an allow-list.
+    Falls back to the endpoint's default fieldset when none is given.
+    """
+    names = list(dict.fromkeys(f.strip() for f in (fields or "").split(",") if f.strip()))
+    if not names:
+        return list(default)
+
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            400,
+            f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+        )
+
+    return names
+
+
+def mongo_projection(names, extra=()) -> dict:
+    """Inclusion projection for the stored fields in `names` plus any lookup keys in `extra`"""
+    projection = {name: 1 for name in (*names, *extra)}
+    if "_id" not in projection:
+        projection["_id"] = 0
+    return projection
+
+
+def stringify_ids(doc: dict) -> dict:
+    """Convert top-level ObjectIds to strings for JSON output"""
+    for key, value in doc.items():
+        if isinstance(value, ObjectId):
+            doc[key] = str(value)
+    return doc
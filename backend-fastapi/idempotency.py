@@ -0,0 +1,153 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pymongo.errors import DuplicateKeyError
+
+from db import idempotency_col
+
+CACHE_MAX_ENTRIES = 1024
+MAX_KEY_LENGTH = 255
+# A claim older than this is treated as abandoned (crashed worker) and can be taken over.
+# It also bounds how long duplicates in this process wait for the first request.
+LEASE_SECONDS = 30
+
+# Front cache of completed responses, so hot retries never reach Mongo
+_cache = OrderedDict()
+_lock = threading.Lock()
+# Requests currently executing in this process, keyed like the cache
+_inflight = {}
+
+
+def _cache_get(key: str):
+    entry = _cache.get(key)
+    if entry is not None:
+        _cache.move_to_end(key)
+    return entry
+
+
+def _cache_put(key: str, entry: dict):
+    _cache[key] = entry
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def _fingerprint(payload) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def _replay(entry: dict, fingerprint: str):
+    if entry["fingerprint"] != fingerprint:
+        raise HTTPException(422, "Idempotency-Key was already used with a different request")
+    return entry["response"]
+
+
+def _claim(key: str, fingerprint: str):
+    """
+    Take the key in Mongo. Returns None when this request now owns it,
+    or the stored entry when an earlier request already completed.
+    """
+    now = datetime.utcnow()
+    locked_until = now + timedelta(seconds=LEASE_SECONDS)
+
+    try:
+        idempotency_col.insert_one({
+            "_id": key,
+            "status": "IN_PROGRESS",
+            "fingerprint": fingerprint,
+            "lockedUntil": locked_until,
+            "createdAt": now
+        })
+        return None
+    except DuplicateKeyError:
+        pass
+
+    stored = idempotency_col.find_one({"_id": key})
+    if stored and stored["status"] == "COMPLETED":
+        return {"fingerprint": stored["fingerprint"], "response": stored["response"]}
+    if stored and stored["fingerprint"] != fingerprint:
+        raise HTTPException(422, "Idempotency-Key was already used with a different request")
+
+    # Take over a claim whose owner never finished within its lease
+    taken = idempotency_col.find_one_and_update(
+        {"_id": key, "status": "IN_PROGRESS", "lockedUntil": {"$lt": now}},
+        {"$set": {"lockedUntil": locked_until}}
+    )
+    if taken:
+        return None
+
+    # Another worker process holds the key and has not finished yet
+    raise HTTPException(409, "A request with this Idempotency-Key is already in progress")
+
+
+def _execute(key: str, fingerprint: str, handler):
+    """Claim the key in Mongo, run the handler once and store its response"""
+    stored = _claim(key, fingerprint)
+    if stored is not None:
+        return stored
+
+    try:
+        response = jsonable_encoder(handler())
+    except Exception:
+        # Failed attempts are not recorded, so the client may retry them
+        idempotency_col.delete_one({"_id": key, "status": "IN_PROGRESS"})
+        raise
+
+    try:
+        idempotency_col.update_one(
+            {"_id": key},
+            {"$set": {"status": "COMPLETED", "response": response}, "$unset": {"lockedUntil": ""}}
+        )
+    except Exception as e:
+        # The write already happened, so still answer the client. Retries in this
+        # process replay from the front cache; elsewhere the lease expires.
+        print("Idempotency store error:", type(e).__name__)
+    return {"fingerprint": fingerprint, "response": response}
+
+
+def run_idempotent(idempotency_key, scope: str, payload, handler):
+    """
+    Run a write handler at most once per Idempotency-Key.
+    Duplicates get the stored response back; concurrent duplicates
+    in this process wait for the first one instead of executing.
+    """
+    if not idempotency_key:
+        return handler()
+
+    if len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(400, "Idempotency-Key is too long")
+
+    key = f"{scope}:{idempotency_key}"
+    fingerprint = _fingerprint(payload)
+
+    while True:
+        with _lock:
+            entry = _cache_get(key)
+            if entry is not None:
+                return _replay(entry, fingerprint)
+
+            event = _inflight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                _inflight[key] = event
+
+        if not leader:
+            # If the leader failed nothing was cached and we loop to take over
+            if not event.wait(LEASE_SECONDS):
+                raise HTTPException(409, "A request with this Idempotency-Key is already in progress")
+            continue
+
+        try:
+            entry = _execute(key, fingerprint, handler)
+            with _lock:
+                _cache_put(key, entry)
+        finally:
+            with _lock:
+                _inflight.pop(key, None)
+            event.set()
+
+        return _replay(entry, fingerprint)
@@ -1,9 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from db import init_db, close_db
+from audit import audit_log
+from medicine_trie import medicine_trie
+from compression import CompressionMiddleware
+from admission import AdmissionControlMiddleware, admission_controller
+from security import system_admin_guard
 from routes import register, login, admin, appointments, prescriptions, hospitals, users
 
-app = FastAPI(title="Secure E-Health Platform")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connection check and index builds happen here, not at import time
+    init_db()
+    audit_log.start()
+    # Autocomplete stays empty until this finishes; startup does not wait for it
+    medicine_trie.start()
+    yield
+    # Drain buffered audit events while the database is still reachable
+    audit_log.stop()
+    close_db()
 
+app = FastAPI(title="Secure E-Health Platform", lifespan=lifespan)
+
+
+# Middleware added first runs innermost: compress, then admission, then CORS.
+# Admission sits inside CORS so that shed 503 responses still carry CORS headers.
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AdmissionControlMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,3 +48,13 @@ app.include_router(users.router)
 @app.get("/")
 def root():
     return {"status": "E-Health Backend Running"}
+
+@app.get("/metrics/admission")
+def admission_metrics(user=Depends(system_admin_guard)):
+    """Per route class concurrency, rejections and queue-wait times"""
+    return admission_controller.snapshot()
+
+@app.get("/metrics/audit")
+def audit_metrics(user=Depends(system_admin_guard)):
+    """Audit buffer depth, flushed and dropped event counts"""
+    return audit_log.snapshot()
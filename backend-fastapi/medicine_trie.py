@@ -0,0 +1,134 @@
+import threading
+import time
+
+from db import prescriptions_col
+
+TOP_K = 10
+# Seconds between build attempts while the database is unreachable
+LOAD_RETRY_INTERVAL = 30.0
+
+
+def normalize_name(name: str) -> str:
+    """Case-insensitive key for a medicine name, shared by the trie and search"""
+    return name.strip().lower()
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        # Keys of the most prescribed medicines under this prefix, best first
+        self.top = []
+
+
+class MedicineTrie:
+    """
+    Case-insensitive prefix trie over prescribed medicine names.
+    Every node caches its top-K names by prescription count, so a
+    suggestion is a walk down the prefix with no subtree scan.
+    The trie is built in a background thread started with the app, and
+    suggests nothing until that build has finished.
+    """
+
+    def __init__(self, top_k: int = TOP_K):
+        self.top_k = top_k
+        self._root = _Node()
+        self._counts = {}  # key -> [display name, count]
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._load_lock = threading.Lock()
+        self._pending = []  # (name, count) prescribed while the build runs
+        self._thread = None
+
+    def _promote(self, node: _Node, key: str):
+        if key not in node.top:
+            node.top.append(key)
+        node.top.sort(key=lambda k: (-self._counts[k][1], k))
+        del node.top[self.top_k:]
+
+    def _add(self, name: str, count: int):
+        display = name.strip()
+        key = normalize_name(name)
+        if not key:
+            return
+
+        entry = self._counts.setdefault(key, [display, 0])
+        entry[1] += count
+
+        # Counts only grow, so a node's top list can only gain this key
+        node = self._root
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+            self._promote(node, key)
+
+    def add(self, name: str, count: int = 1):
+        """
+        Record a newly prescribed medicine. Inserts made while the trie is
+        being built are queued and applied when the build finishes. A
+        prescription the build has already read is then counted twice, so
+        counts are approximate for anything prescribed during the build.
+        """
+        with self._lock:
+            if self._ready.is_set():
+                self._add(name, count)
+            else:
+                self._pending.append((name, count))
+
+    def ensure_loaded(self):
+        """Build the trie from the prescriptions collection, blocking until done"""
+        with self._load_lock:
+            if self._ready.is_set():
+                return
+            rows = list(prescriptions_col.aggregate([
+                {"$unwind": "$medicines"},
+                {"$group": {"_id": "$medicines.name", "count": {"$sum": 1}}}
+            ]))
+            with self._lock:
+                for row in rows:
+                    if isinstance(row["_id"], str):
+                        self._add(row["_id"], row["count"])
+                for name, count in self._pending:
+                    self._add(name, count)
+                self._pending.clear()
+                self._ready.set()
+
+    def _load_until_ready(self, retry_interval: float):
+        while not self._ready.is_set():
+            try:
+                self.ensure_loaded()
+            except Exception as e:
+                print("Medicine trie load error:", e)
+                time.sleep(retry_interval)
+
+    def start(self, retry_interval: float = LOAD_RETRY_INTERVAL):
+        """Build the trie in a background thread, so neither startup nor requests wait on it"""
+        if self._ready.is_set() or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._load_until_ready, args=(retry_interval,), name="medicine-trie-loader", daemon=True
+        )
+        self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the trie is built; False if the timeout passed first"""
+        return self._ready.wait(timeout)
+
+    def suggest(self, prefix: str, limit: int = TOP_K):
+        if not self._ready.is_set():
+            return []
+        key = normalize_name(prefix)
+
+        with self._lock:
+            node = self._root
+            for ch in key:
+                node = node.children.get(ch)
+                if node is None:
+                    return []
+            return [
+                {"name": self._counts[k][0], "count": self._counts[k][1]}
+                for k in node.top[:limit]
+            ]
+
+
+medicine_trie = MedicineTrie()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -47,4 +47,63 @@ class PrescriptionCreate(BaseModel):
     appointmentId: str
     diagnosis: str
     medicines: List[Medicine]
-    notes: Optional[str] = ""
\ No newline at end of file
+    notes: Optional[str] = ""
+
+##------ List responses: each model's fields are that endpoint's default projection ------##
+
+class HospitalSummary(BaseModel):
+    hospitalId: str
+    hospitalName: str
+    city: Optional[str] = None
+
+class DoctorDirectoryEntry(BaseModel):
+    id: str = Field(alias="_id")
+    name: str
+    specialization: str
+
+class HospitalDoctorEntry(BaseModel):
+    id: str = Field(alias="_id")
+    name: str
+    email: EmailStr
+    phone: str
+    specialization: str
+    licenseNumber: str
+    status: str
+    createdAt: datetime
+
+class PatientAppointment(BaseModel):
+    id: str = Field(alias="_id")
+    doctorId: str
+    hospitalId: str
+    slot: datetime
+    status: str
+    doctorName: str
+    specialization: str
+    hospitalName: str
+    hospitalCity: str
+    hospitalCoords: Optional[List[float]] = None
+
+class DoctorAppointment(BaseModel):
+    id: str = Field(alias="_id")
+    patientId: str
+    slot: datetime
+    status: str
+    patientName: str
+    patientEmail: str
+
+class PatientPrescription(BaseModel):
+    id: str = Field(alias="_id")
+    doctorId: str
+    hospitalId: str
+    diagnosis: str
+    medicines: List[Medicine]
+    notes: Optional[str] = ""
+    createdAt: datetime
+    hash: str
+
+class DoctorPrescriptionSummary(BaseModel):
+    id: str = Field(alias="_id")
+    patientId: str
+    appointmentId: str
+    diagnosis: str
+    createdAt: datetime
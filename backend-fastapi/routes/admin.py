@@ -1,14 +1,20 @@
+from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException
 from db import users_col, hospitals_col
 from jose import jwt
 from auth import SECRET_KEY, ALGORITHM
 from bson import ObjectId
 from fastapi.security import OAuth2PasswordBearer
+from fieldsets import model_fields, select_fields, mongo_projection
+from models import HospitalDoctorEntry
 
 # 1. Setup Router & Security
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/hospital-admin")
 router = APIRouter(prefix="/hospital-admin", tags=["Hospital Admin"])
 
+DOCTOR_DEFAULT_FIELDS = model_fields(HospitalDoctorEntry)
+DOCTOR_FIELDS = {*DOCTOR_DEFAULT_FIELDS, "hospitalId", "location"}
+
 def admin_guard(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -56,8 +62,9 @@ def get_hospital_overview(admin_payload=Depends(admin_guard)):
     }
 
 # 3. Get All Doctors (Pending & Approved)
-@router.get("/doctors")
-def get_all_doctors(admin_payload=Depends(admin_guard)):
+@router.get("/doctors", responses={200: {"model": List[HospitalDoctorEntry]}})
+def get_all_doctors(fields: Optional[str] = None, admin_payload=Depends(admin_guard)):
+    names = select_fields(fields, DOCTOR_FIELDS, DOCTOR_DEFAULT_FIELDS)
     
     # Get Admin's Hospital ID
     admin_id = admin_payload["user_id"]
@@ -74,12 +81,13 @@ def get_all_doctors(admin_payload=Depends(admin_guard)):
             "hospitalId": hospital_id,
             "status": {"$in": ["PENDING", "APPROVED"]} # <--- Fetch both types
         }, 
-        {"passwordHash": 0}
+        mongo_projection(names)
     ))
     
     # Convert ObjectId to string
     for doc in doctors:
-        doc["_id"] = str(doc["_id"])
+        if "_id" in doc:
+            doc["_id"] = str(doc["_id"])
         
     return doctors
 
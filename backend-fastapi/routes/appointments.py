@@ -1,76 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
 from datetime import datetime
+from typing import Optional, List
 import pytz
 from bson import ObjectId
+from config import IST
 # Import hospitals_col to fetch hospital names
 from db import users_col, appointments_col, hospitals_col 
-from models import AppointmentRequest
+from models import AppointmentRequest, DoctorDirectoryEntry, PatientAppointment, DoctorAppointment
 from security import patient_guard, doctor_guard
+from idempotency import run_idempotent
+from fieldsets import model_fields, select_fields, mongo_projection, stringify_ids
+from audit import audit_log
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
-IST = pytz.timezone("Asia/Kolkata")
 
-@router.get("/hospitals/{hospital_id}/doctors")
-def get_doctors_by_hospital(hospital_id: str):
+# Public doctor directory: no contact details or duplicated lat/long
+DIRECTORY_DEFAULT_FIELDS = model_fields(DoctorDirectoryEntry)
+DIRECTORY_FIELDS = {*DIRECTORY_DEFAULT_FIELDS, "hospitalId", "location"}
+
+APPOINTMENT_FIELDS = {"_id", "patientId", "doctorId", "hospitalId", "slot", "status", "createdAt"}
+
+# Filled in from users/hospitals after the appointment query
+PATIENT_LOOKUP_FIELDS = {"doctorName", "specialization", "hospitalName", "hospitalCity", "hospitalCoords"}
+PATIENT_DEFAULT_FIELDS = model_fields(PatientAppointment)
+
+DOCTOR_LOOKUP_FIELDS = {"patientName", "patientEmail"}
+DOCTOR_DEFAULT_FIELDS = model_fields(DoctorAppointment)
+
+@router.get("/hospitals/{hospital_id}/doctors", responses={200: {"model": List[DoctorDirectoryEntry]}})
+def get_doctors_by_hospital(hospital_id: str, fields: Optional[str] = None):
+    names = select_fields(fields, DIRECTORY_FIELDS, DIRECTORY_DEFAULT_FIELDS)
     doctors = list(users_col.find(
         {"hospitalId": hospital_id, "role": "DOCTOR", "status": "APPROVED"},
-        {"passwordHash": 0}
+        mongo_projection(names)
     ))
     
     for doc in doctors:
-        doc["_id"] = str(doc["_id"])
+        stringify_ids(doc)
         
     return doctors
 
-@router.get("/patient")
-def get_my_appointments(user=Depends(patient_guard)):
+@router.get("/patient", responses={200: {"model": List[PatientAppointment]}})
+def get_my_appointments(fields: Optional[str] = None, user=Depends(patient_guard)):
     """Fetch appointments AND look up details + coordinates"""
+    names = select_fields(fields, APPOINTMENT_FIELDS | PATIENT_LOOKUP_FIELDS, PATIENT_DEFAULT_FIELDS)
+    stored = [name for name in names if name in APPOINTMENT_FIELDS]
+
+    # Only run the per-row lookups whose output was asked for
+    need_doctor = bool({"doctorName", "specialization"} & set(names))
+    need_hospital = bool({"hospitalName", "hospitalCity", "hospitalCoords"} & set(names))
+    lookup_keys = (["doctorId"] if need_doctor else []) + (["hospitalId"] if need_hospital else [])
     
     appointments = list(appointments_col.find(
         {"patientId": ObjectId(user["user_id"])},
-        {"_id": 1, "doctorId": 1, "hospitalId": 1, "slot": 1, "status": 1, "patientId": 1}
+        mongo_projection(stored, lookup_keys)
     ).sort("slot", -1)) 
 
     for apt in appointments:
-        apt["_id"] = str(apt["_id"])
-        apt["patientId"] = str(apt["patientId"])
-        
         # Timezone fix
         if apt.get("slot") and apt["slot"].tzinfo is None:
              apt["slot"] = pytz.utc.localize(apt["slot"])
         
         # Doctor Lookup
-        doc = users_col.find_one({"_id": apt["doctorId"]}, {"name": 1, "specialization": 1})
-        if doc:
-            apt["doctorName"] = doc.get("name", "Unknown Doctor")
-            apt["specialization"] = doc.get("specialization", "General Physician")
-        else:
-            apt["doctorName"] = "Unknown"
-            apt["specialization"] = "N/A"
-        
-        apt["doctorId"] = str(apt["doctorId"])
+        if need_doctor:
+            doc = users_col.find_one({"_id": apt["doctorId"]}, {"name": 1, "specialization": 1})
+            if doc:
+                apt["doctorName"] = doc.get("name", "Unknown Doctor")
+                apt["specialization"] = doc.get("specialization", "General Physician")
+            else:
+                apt["doctorName"] = "Unknown"
+                apt["specialization"] = "N/A"
 
         # Hospital Lookup (FETCH LOCATION)
-        hosp = hospitals_col.find_one(
-            {"hospitalId": apt["hospitalId"]}, 
-            {"hospitalName": 1, "city": 1, "location": 1} # <--- Request location
-        )
-        
-        if hosp:
-            apt["hospitalName"] = hosp.get("hospitalName", "Unknown Hospital")
-            apt["hospitalCity"] = hosp.get("city", "")
-            # MongoDB GeoJSON is [long, lat]
-            apt["hospitalCoords"] = hosp.get("location", {}).get("coordinates") 
-        else:
-            apt["hospitalName"] = "Unknown Hospital"
-            apt["hospitalCity"] = ""
-            apt["hospitalCoords"] = None
+        if need_hospital:
+            hosp = hospitals_col.find_one(
+                {"hospitalId": apt["hospitalId"]}, 
+                {"hospitalName": 1, "city": 1, "location": 1} # <--- Request location
+            )
+            
+            if hosp:
+                apt["hospitalName"] = hosp.get("hospitalName", "Unknown Hospital")
+                apt["hospitalCity"] = hosp.get("city", "")
+                # MongoDB GeoJSON is [long, lat]
+                apt["hospitalCoords"] = hosp.get("location", {}).get("coordinates") 
+            else:
+                apt["hospitalName"] = "Unknown Hospital"
+                apt["hospitalCity"] = ""
+                apt["hospitalCoords"] = None
+
+        # Drop lookup keys and lookup results that were not requested
+        for key in list(apt):
+            if key not in names:
+                del apt[key]
+
+        stringify_ids(apt)
+
+    audit_log.record(user, "READ", "appointments", [user["user_id"]], count=len(appointments))
 
     return appointments
 
 @router.post("/request")
-def request_appointment(data: AppointmentRequest, user=Depends(patient_guard)):
+def request_appointment(
+    data: AppointmentRequest,
+    user=Depends(patient_guard),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    return run_idempotent(
+        idempotency_key,
+        f"appointments:{user['user_id']}",
+        data,
+        lambda: _book_appointment(data, user)
+    )
 
+def _book_appointment(data: AppointmentRequest, user: dict):
     doctor = users_col.find_one({
         "_id": ObjectId(data.doctorId),
         "hospitalId": data.hospitalId,
@@ -121,35 +163,46 @@ def accept_appointment(appointment_id: str, user=Depends(doctor_guard)):
 
     return {"message": "Appointment accepted"}
 
-@router.get("/doctor/my-appointments")
-def get_doctor_appointments(user=Depends(doctor_guard)):
+@router.get("/doctor/my-appointments", responses={200: {"model": List[DoctorAppointment]}})
+def get_doctor_appointments(fields: Optional[str] = None, user=Depends(doctor_guard)):
     """Fetch all appointments for the logged-in DOCTOR"""
+    names = select_fields(fields, APPOINTMENT_FIELDS | DOCTOR_LOOKUP_FIELDS, DOCTOR_DEFAULT_FIELDS)
+    stored = [name for name in names if name in APPOINTMENT_FIELDS]
+    need_patient = bool(DOCTOR_LOOKUP_FIELDS & set(names))
     
-    # 1. Fetch appointments
+    # 1. Fetch appointments (patientId is always read for the audit trail)
     appointments = list(appointments_col.find(
         {"doctorId": ObjectId(user["user_id"])},
-        # FIX: Added "doctorId": 1 to this list
-        {"_id": 1, "patientId": 1, "hospitalId": 1, "slot": 1, "status": 1, "doctorId": 1}
+        mongo_projection(stored, ["patientId"])
     ).sort("slot", 1)) 
 
+    audit_log.record(
+        user, "READ", "appointments",
+        [apt.get("patientId") for apt in appointments],
+        count=len(appointments)
+    )
+
     for apt in appointments:
-        apt["_id"] = str(apt["_id"])
-        apt["doctorId"] = str(apt["doctorId"]) # Now this works
-        
         # Timezone fix
         if apt.get("slot") and apt["slot"].tzinfo is None:
              apt["slot"] = pytz.utc.localize(apt["slot"])
 
         # 2. Enrich with PATIENT Name
-        patient = users_col.find_one({"_id": apt["patientId"]}, {"name": 1, "email": 1})
-        
-        if patient:
-            apt["patientName"] = patient.get("name", "Unknown Patient")
-            apt["patientEmail"] = patient.get("email", "")
-        else:
-            apt["patientName"] = "Unknown Patient"
-            apt["patientEmail"] = ""
+        if need_patient:
+            patient = users_col.find_one({"_id": apt["patientId"]}, {"name": 1, "email": 1})
             
-        apt["patientId"] = str(apt["patientId"])
+            if patient:
+                apt["patientName"] = patient.get("name", "Unknown Patient")
+                apt["patientEmail"] = patient.get("email", "")
+            else:
+                apt["patientName"] = "Unknown Patient"
+                apt["patientEmail"] = ""
+
+        # Drop lookup keys and lookup results that were not requested
+        for key in list(apt):
+            if key not in names:
+                del apt[key]
+
+        stringify_ids(apt)
 
     return appointments
\ No newline at end of file
@@ -1,18 +1,25 @@
+from typing import Optional, List
 from fastapi import APIRouter, HTTPException
 from db import hospitals_col
+from fieldsets import model_fields, select_fields, mongo_projection
+from models import HospitalSummary
 
 # Public route - anyone can see the list of hospitals
 router = APIRouter(prefix="/hospitals", tags=["Hospitals"])
 
-@router.get("/")
-def get_all_hospitals():
+HOSPITAL_DEFAULT_FIELDS = model_fields(HospitalSummary)
+HOSPITAL_FIELDS = {*HOSPITAL_DEFAULT_FIELDS, "state", "address", "phone", "location"}
+
+@router.get("/", responses={200: {"model": List[HospitalSummary]}})
+def get_all_hospitals(fields: Optional[str] = None):
     """
     Fetch all hospitals. 
     Used to populate dropdowns in the frontend.
     """
-    # We exclude '_id' to return cleaner JSON, 
-    # relying on your custom 'hospitalId' as the unique key.
-    hospitals = list(hospitals_col.find({}, {"_id": 0}))
+    # '_id' is never projected, relying on your custom 'hospitalId'
+    # as the unique key. The default fieldset is what the dropdown needs.
+    names = select_fields(fields, HOSPITAL_FIELDS, HOSPITAL_DEFAULT_FIELDS)
+    hospitals = list(hospitals_col.find({}, mongo_projection(names)))
     
     return hospitals
 
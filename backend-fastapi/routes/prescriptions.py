@@ -1,18 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from datetime import datetime
-import pytz
+from typing import Optional, List
 from bson import ObjectId
-import hashlib, json
+import hashlib, json, re
 
+from config import IST
 from db import prescriptions_col, appointments_col
-from models import PrescriptionCreate
+from models import PrescriptionCreate, Medicine, PatientPrescription, DoctorPrescriptionSummary
 from security import doctor_guard, patient_guard
+from idempotency import run_idempotent
+from medicine_trie import medicine_trie, normalize_name
+from fieldsets import model_fields, select_fields, mongo_projection, stringify_ids
+from audit import audit_log
 
 router = APIRouter(prefix="/prescriptions", tags=["Prescriptions"])
-IST = pytz.timezone("Asia/Kolkata")
+
+PRESCRIPTION_FIELDS = {
+    "_id", "patientId", "doctorId", "hospitalId", "appointmentId",
+    "diagnosis", "medicines", "notes", "createdAt", "hash"
+}
+# The patient dashboard renders medicines and exports notes + hash to PDF
+PATIENT_DEFAULT_FIELDS = model_fields(PatientPrescription)
+DOCTOR_DEFAULT_FIELDS = model_fields(DoctorPrescriptionSummary)
+
+# Stored medicines also carry nameLower for search; responses only return the model's fields
+MEDICINE_PATHS = [f"medicines.{name}" for name in Medicine.model_fields]
+
+def _projection(names, extra=()) -> dict:
+    paths = [path for name in names for path in (MEDICINE_PATHS if name == "medicines" else [name])]
+    return mongo_projection(paths, extra)
 
 @router.post("/doctor")
-def create_prescription(data: PrescriptionCreate, user=Depends(doctor_guard)):
+def create_prescription(
+    data: PrescriptionCreate,
+    user=Depends(doctor_guard),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    return run_idempotent(
+        idempotency_key,
+        f"prescriptions:{user['user_id']}",
+        data,
+        lambda: _insert_prescription(data, user)
+    )
+
+def _insert_prescription(data: PrescriptionCreate, user: dict):
     try:
         appointment = appointments_col.find_one({
             "_id": ObjectId(data.appointmentId),
@@ -38,8 +69,15 @@ def create_prescription(data: PrescriptionCreate, user=Depends(doctor_guard)):
         hash_value = hashlib.sha256(json.dumps(prescription, default=str).encode()).hexdigest()
         prescription["hash"] = hash_value
 
+        # Search key only, so it is left out of the hash
+        for medicine in prescription["medicines"]:
+            medicine["nameLower"] = normalize_name(medicine["name"])
+
         prescriptions_col.insert_one(prescription)
 
+        for medicine in data.medicines:
+            medicine_trie.add(medicine.name)
+
         return {
             "message": "Prescription created successfully",
             "hash": hash_value
@@ -51,50 +89,114 @@ def create_prescription(data: PrescriptionCreate, user=Depends(doctor_guard)):
         raise HTTPException(500, f"Prescription creation failed: {str(e)}")
 
 
-@router.get("/patient")
-def get_my_prescriptions(user=Depends(patient_guard)):
+@router.get("/patient", responses={200: {"model": List[PatientPrescription]}})
+def get_my_prescriptions(fields: Optional[str] = None, user=Depends(patient_guard)):
+    names = select_fields(fields, PRESCRIPTION_FIELDS, PATIENT_DEFAULT_FIELDS)
     try:
         # 1. Fetch from DB
         prescriptions = list(prescriptions_col.find(
-            {"patientId": ObjectId(user["user_id"])}
+            {"patientId": ObjectId(user["user_id"])},
+            _projection(names)
         ))
 
         # 2. FIX: Convert ALL ObjectIds to Strings
+        # (hospitalId / appointmentId might not exist in old records)
         for pres in prescriptions:
-            pres["_id"] = str(pres["_id"])
-            pres["patientId"] = str(pres["patientId"])
-            pres["doctorId"] = str(pres["doctorId"])
-            
-            # These fields might not exist in old records, so we use .get() or check
-            if "hospitalId" in pres:
-                pres["hospitalId"] = str(pres["hospitalId"])
-            if "appointmentId" in pres:
-                pres["appointmentId"] = str(pres["appointmentId"])
-                
+            stringify_ids(pres)
+
+        audit_log.record(user, "READ", "prescriptions", [user["user_id"]], count=len(prescriptions))
+
         return prescriptions
     except Exception as e:
         print(f"Error fetching prescriptions: {e}") # Debugging
         raise HTTPException(500, f"Fetch failed: {str(e)}")
 
-@router.get("/doctor")
-def get_doctor_prescriptions(user=Depends(doctor_guard)):
+@router.get("/doctor", responses={200: {"model": List[DoctorPrescriptionSummary]}})
+def get_doctor_prescriptions(fields: Optional[str] = None, user=Depends(doctor_guard)):
+    names = select_fields(fields, PRESCRIPTION_FIELDS, DOCTOR_DEFAULT_FIELDS)
     try:
         # 1. Fetch from DB
+        # patientId is always read for the audit trail
         prescriptions = list(prescriptions_col.find(
-            {"doctorId": ObjectId(user["user_id"])}
+            {"doctorId": ObjectId(user["user_id"])},
+            _projection(names, ["patientId"])
         ))
 
+        audit_log.record(
+            user, "READ", "prescriptions",
+            [pres["patientId"] for pres in prescriptions],
+            count=len(prescriptions)
+        )
+
         # 2. FIX: Convert ALL ObjectIds to Strings
+        # (hospitalId / appointmentId might not exist in old records)
+        for pres in prescriptions:
+            if "patientId" not in names:
+                del pres["patientId"]
+            stringify_ids(pres)
+
+        return prescriptions
+    except Exception as e:
+        raise HTTPException(500, f"Fetch failed: {str(e)}")
+
+@router.get("/doctor/search", responses={200: {"model": List[DoctorPrescriptionSummary]}})
+def search_doctor_prescriptions(
+    q: Optional[str] = None,
+    medicine: Optional[str] = None,
+    from_date: Optional[datetime] = Query(None, alias="from"),
+    to_date: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = None,
+    user=Depends(doctor_guard)
+):
+    """Search the doctor's own prescriptions by text, medicine name and date"""
+    names = select_fields(fields, PRESCRIPTION_FIELDS, DOCTOR_DEFAULT_FIELDS)
+    query = {"doctorId": ObjectId(user["user_id"])}
+
+    if q:
+        query["$text"] = {"$search": q}
+    if medicine:
+        # Anchored prefix on the lowercased name, so it matches the suggestions and uses the index
+        query["medicines.nameLower"] = {"$regex": "^" + re.escape(normalize_name(medicine))}
+    if from_date or to_date:
+        query["createdAt"] = {}
+        if from_date:
+            query["createdAt"]["$gte"] = from_date
+        if to_date:
+            query["createdAt"]["$lte"] = to_date
+
+    try:
+        if q:
+            projection = {**_projection(names, ["patientId"]), "score": {"$meta": "textScore"}}
+            cursor = prescriptions_col.find(query, projection)
+            cursor = cursor.sort([("score", {"$meta": "textScore"})])
+        else:
+            cursor = prescriptions_col.find(query, _projection(names, ["patientId"]))
+            cursor = cursor.sort("createdAt", -1)
+
+        prescriptions = list(cursor.limit(limit))
+
+        audit_log.record(
+            user, "SEARCH", "prescriptions",
+            [pres["patientId"] for pres in prescriptions],
+            count=len(prescriptions)
+        )
+
         for pres in prescriptions:
-            pres["_id"] = str(pres["_id"])
-            pres["patientId"] = str(pres["patientId"])
-            pres["doctorId"] = str(pres["doctorId"])
-            
-            if "hospitalId" in pres:
-                pres["hospitalId"] = str(pres["hospitalId"])
-            if "appointmentId" in pres:
-                pres["appointmentId"] = str(pres["appointmentId"])
+            pres.pop("score", None)
+            if "patientId" not in names:
+                del pres["patientId"]
+            stringify_ids(pres)
 
         return prescriptions
     except Exception as e:
-        raise HTTPException(500, f"Fetch failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Search failed: {str(e)}")
+
+@router.get("/medicines/suggest")
+def suggest_medicines(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=10),
+    user=Depends(doctor_guard)
+):
+    """Medicine name autocomplete, most prescribed first"""
+    return medicine_trie.suggest(prefix, limit)
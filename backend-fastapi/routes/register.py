@@ -1,12 +1,11 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
-import pytz
+from config import IST
 from db import users_col
 from auth import hash_password
 from models import PatientRegister, DoctorRegister, HospitalAdminRegister
 
 router = APIRouter(prefix="/register", tags=["Register"])
-IST = pytz.timezone("Asia/Kolkata")
 
 @router.post("/patient")
 def register_patient(data: PatientRegister):
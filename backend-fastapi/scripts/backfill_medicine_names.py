@@ -0,0 +1,48 @@
+"""
+One-off backfill of medicines.nameLower on prescriptions written before
+medicine search became case-insensitive.
+
+    python scripts/backfill_medicine_names.py
+
+nameLower is a derived search key and is never part of the prescription
+hash, so existing hashes stay valid.
+"""
+import sys
+from pathlib import Path
+
+from pymongo import UpdateOne
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import prescriptions_col  # noqa: E402
+from medicine_trie import normalize_name  # noqa: E402
+
+BATCH_SIZE = 1000
+
+
+def main():
+    cursor = prescriptions_col.find(
+        {"medicines": {"$elemMatch": {"nameLower": {"$exists": False}}}},
+        {"medicines": 1}
+    )
+
+    updated = 0
+    batch = []
+    for pres in cursor:
+        medicines = [
+            {**m, "nameLower": normalize_name(m.get("name") or "")}
+            for m in pres["medicines"]
+        ]
+        batch.append(UpdateOne({"_id": pres["_id"]}, {"$set": {"medicines": medicines}}))
+        if len(batch) >= BATCH_SIZE:
+            updated += prescriptions_col.bulk_write(batch, ordered=False).modified_count
+            batch = []
+
+    if batch:
+        updated += prescriptions_col.bulk_write(batch, ordered=False).modified_count
+
+    print(f"Backfilled medicines.nameLower on {updated} prescriptions")
+
+
+if __name__ == "__main__":
+    main()
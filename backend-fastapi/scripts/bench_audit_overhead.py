@@ -0,0 +1,126 @@
+"""
+Request overhead of the PHI audit trail, auditing on vs off.
+
+Drives the audited read endpoints from --threads concurrent clients twice:
+once with the audit log disabled and once with it recording and flushing
+in the background. Prints p50/p95 latency and throughput for both, plus
+the cost of a bare record() call. Runs in-process against mongomock (dev
+dependency group) by default; set MONGO_URI to use a real MongoDB, whose
+separate --db database (default ehealth_bench) is cleared and reseeded.
+
+    python scripts/bench_audit_overhead.py
+    MONGO_URI=mongodb://localhost:27017 python scripts/bench_audit_overhead.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ENDPOINTS = [
+    ("/prescriptions/patient", "patient"),
+    ("/appointments/patient", "patient"),
+    ("/prescriptions/doctor", "doctor"),
+    ("/appointments/doctor/my-appointments", "doctor"),
+]
+
+
+def seed(db):
+    for col in (db.users_col, db.appointments_col, db.prescriptions_col, db.audit_col):
+        col.delete_many({})
+    doctor_id = db.users_col.insert_one({"name": "Dr Rao", "role": "DOCTOR", "hospitalId": "H1"}).inserted_id
+    patient_id = db.users_col.insert_one({"name": "Asha", "role": "PATIENT"}).inserted_id
+    start = datetime(2025, 6, 1)
+    db.appointments_col.insert_many([
+        {"patientId": patient_id, "doctorId": doctor_id, "hospitalId": "H1",
+         "slot": start + timedelta(hours=i), "status": "ACCEPTED", "createdAt": start}
+        for i in range(20)
+    ])
+    db.prescriptions_col.insert_many([
+        {"patientId": patient_id, "doctorId": doctor_id, "hospitalId": "H1", "diagnosis": "Hypertension",
+         "medicines": [{"name": "Amlodipine 5mg", "dosage": "1 tab", "frequency": "OD", "duration": "30d"}],
+         "notes": "", "createdAt": start, "hash": f"{i:064x}"}
+        for i in range(20)
+    ])
+    return doctor_id, patient_id
+
+
+def run(client, headers: dict, threads: int, requests: int):
+    def call(i):
+        path, who = ENDPOINTS[i % len(ENDPOINTS)]
+        started = time.perf_counter()
+        response = client.get(path, headers=headers[who])
+        assert response.status_code == 200, (path, response.text)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = sorted(pool.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--db", default="ehealth_bench")
+    args = parser.parse_args()
+
+    if "MONGO_URI" not in os.environ:
+        import mongomock
+        import pymongo.mongo_client
+        pymongo.mongo_client.MongoClient = mongomock.MongoClient
+        os.environ["MONGO_URI"] = "mongodb://localhost:27017"
+    # Must be set before db.py is imported
+    os.environ["MONGO_DB"] = args.db
+    os.environ["AUDIT_ENABLED"] = "true"
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+    from fastapi.testclient import TestClient
+
+    import db
+    from audit import AuditLog, audit_log
+    from auth import create_access_token
+    from main import app
+
+    def header(user_id, role):
+        return {"Authorization": f"Bearer {create_access_token({'user_id': str(user_id), 'role': role})}"}
+
+    # Buffer-only instance, nothing is flushed
+    standalone = AuditLog(None, capacity=10000)
+    started = time.perf_counter()
+    for _ in range(10000):
+        standalone.record({"user_id": "bench", "role": "DOCTOR"}, "READ", "prescriptions", ["p1", "p2"])
+    print(f"record() {(time.perf_counter() - started) * 100:.2f} us per call")
+
+    with TestClient(app) as client:
+        doctor_id, patient_id = seed(db)
+        headers = {"doctor": header(doctor_id, "DOCTOR"), "patient": header(patient_id, "PATIENT")}
+        run(client, headers, args.threads, 200)  # warm up
+
+        results = {"off": [], "on": []}
+        # Alternate the modes so drift affects both equally
+        for _ in range(args.rounds):
+            for mode in results:
+                audit_log.enabled = mode == "on"
+                results[mode].append(run(client, headers, args.threads, args.requests))
+        audit_log.enabled = True
+
+    summary = {mode: [statistics.median(values) for values in zip(*rounds)] for mode, rounds in results.items()}
+    for mode, (p50, p95, rps) in summary.items():
+        print(f"audit {mode:<3}  p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  {rps:8.1f} req/s")
+    (off_p50, off_p95, off_rps), (on_p50, on_p95, on_rps) = summary["off"], summary["on"]
+    print(f"overhead   p50 {on_p50 - off_p50:+7.2f} ms  p95 {on_p95 - off_p95:+7.2f} ms  "
+          f"{(on_rps / off_rps - 1) * 100:+7.1f} % throughput")
+    print("audit log", audit_log.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Bytes-on-the-wire and latency benchmark for the dashboard list endpoints.
+
+Seeds an in-memory Mongo (mongomock, from the dev dependency group) with a
+dashboard-sized dataset. Then, for each page's list calls, it compares
+every allowed field (close to the old full-document responses) with the
+default fieldset, sent as identity, gzip and brotli. Latency is measured
+in-process through TestClient, so it covers routing, projection,
+serialisation and compression, but not real database time.
+
+    python scripts/bench_list_payloads.py
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import mongomock
+import pymongo.mongo_client
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pymongo.mongo_client.MongoClient = mongomock.MongoClient
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ["AUDIT_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import db  # noqa: E402
+from auth import create_access_token  # noqa: E402
+from main import app  # noqa: E402
+from routes import admin, appointments, hospitals, prescriptions  # noqa: E402
+
+MEDICINES = ["Amlodipine 5mg", "Metformin 500mg", "Pantoprazole 40mg", "Paracetamol 650mg", "Atorvastatin 10mg"]
+
+
+def seed(rng: random.Random) -> dict:
+    db.hospitals_col.insert_many([
+        {
+            "hospitalId": f"H{i}",
+            "hospitalName": f"Sanjeevani Multispeciality Hospital {i}",
+            "city": "Bengaluru",
+            "state": "Karnataka",
+            "address": f"{i} Outer Ring Road, Marathahalli, Bengaluru 560037",
+            "phone": f"+91 80 4000 {i:04d}",
+            "location": {"type": "Point", "coordinates": [77.5 + i / 1000, 12.9 + i / 1000]}
+        }
+        for i in range(150)
+    ])
+
+    doctor_ids = db.users_col.insert_many([
+        {
+            "name": f"Dr Doctor {i}",
+            "email": f"doctor{i}@example.com",
+            "phone": f"98450{i:05d}",
+            "passwordHash": "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 70,
+            "role": "DOCTOR",
+            "specialization": "General Medicine",
+            "licenseNumber": f"KMC-{100000 + i}",
+            "hospitalId": "H1",
+            "location": {"type": "Point", "coordinates": [77.6, 12.97]},
+            "latitude": 12.97,
+            "longitude": 77.6,
+            "status": "APPROVED",
+            "createdAt": datetime(2025, 1, 1)
+        }
+        for i in range(40)
+    ]).inserted_ids
+    patient_id = db.users_col.insert_one({"name": "Asha", "email": "asha@example.com", "role": "PATIENT"}).inserted_id
+    admin_id = db.users_col.insert_one({"name": "Admin", "role": "HOSPITAL_ADMIN", "hospitalId": "H1"}).inserted_id
+
+    doctor_id = doctor_ids[0]
+    start = datetime(2025, 6, 1)
+    db.appointments_col.insert_many([
+        {
+            "patientId": patient_id,
+            "doctorId": doctor_id if i % 2 else rng.choice(doctor_ids),
+            "hospitalId": "H1",
+            "slot": start + timedelta(hours=i),
+            "status": rng.choice(["REQUESTED", "ACCEPTED"]),
+            "createdAt": start
+        }
+        for i in range(120)
+    ])
+    db.prescriptions_col.insert_many([
+        {
+            "patientId": patient_id,
+            "doctorId": doctor_id,
+            "hospitalId": "H1",
+            "appointmentId": db.appointments_col.find_one()["_id"],
+            "diagnosis": "Hypertension with mild dyslipidemia",
+            "medicines": [
+                {"name": m, "dosage": "1 tab", "frequency": "OD", "duration": "30d", "nameLower": m.lower()}
+                for m in rng.sample(MEDICINES, 3)
+            ],
+            "notes": "Low salt diet, brisk walk 30 minutes daily, review lipid profile in 3 months.",
+            "createdAt": start,
+            "hash": "%064x" % rng.getrandbits(256)
+        }
+        for _ in range(80)
+    ])
+
+    def header(user_id, role):
+        token = create_access_token({"user_id": str(user_id), "role": role, "name": role})
+        return {"Authorization": f"Bearer {token}"}
+
+    return {
+        "patient": header(patient_id, "PATIENT"),
+        "doctor": header(doctor_id, "DOCTOR"),
+        "admin": header(admin_id, "HOSPITAL_ADMIN"),
+        "public": {},
+    }
+
+
+# page -> [(path, auth, allow-list of that endpoint)]
+PAGES = {
+    "patient dashboard": [
+        ("/appointments/patient", "patient", appointments.APPOINTMENT_FIELDS | appointments.PATIENT_LOOKUP_FIELDS),
+        ("/prescriptions/patient", "patient", prescriptions.PRESCRIPTION_FIELDS),
+        ("/hospitals/", "public", hospitals.HOSPITAL_FIELDS),
+        ("/appointments/hospitals/H1/doctors", "public", appointments.DIRECTORY_FIELDS),
+    ],
+    "doctor dashboard": [
+        ("/appointments/doctor/my-appointments", "doctor",
+         appointments.APPOINTMENT_FIELDS | appointments.DOCTOR_LOOKUP_FIELDS),
+        ("/prescriptions/doctor", "doctor", prescriptions.PRESCRIPTION_FIELDS),
+    ],
+    "hospital admin": [
+        ("/hospital-admin/doctors", "admin", admin.DOCTOR_FIELDS),
+    ],
+}
+
+
+def measure(client, url: str, headers: dict, encoding: str, runs: int):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.get(url, headers={**headers, "Accept-Encoding": encoding})
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, (url, response.text)
+    # httpx decodes the body, so read the size that actually went over the wire
+    size = int(response.headers.get("content-length", len(response.content)))
+    return size, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        auth = seed(random.Random(1))
+
+        print(f"{'page / endpoint':<44} {'fields':<8} {'identity':>10} {'gzip':>9} {'br':>9} {'p50 id':>9} {'p50 br':>9}")
+        for page, calls in PAGES.items():
+            totals = {"all": [0, 0, 0], "default": [0, 0, 0]}
+            print(page)
+            for path, who, allowed in calls:
+                for label, url in (("all", f"{path}?fields={','.join(sorted(allowed))}"), ("default", path)):
+                    identity, identity_ms = measure(client, url, auth[who], "identity", args.runs)
+                    gzip_size, _ = measure(client, url, auth[who], "gzip", args.runs)
+                    br_size, br_ms = measure(client, url, auth[who], "br", args.runs)
+                    for i, size in enumerate((identity, gzip_size, br_size)):
+                        totals[label][i] += size
+                    print(f"  {path:<42} {label:<8} {identity:>10,} {gzip_size:>9,} {br_size:>9,} "
+                          f"{identity_ms:>7.2f}ms {br_ms:>7.2f}ms")
+            for label, (identity, gzip_size, br_size) in totals.items():
+                print(f"  {'page total':<42} {label:<8} {identity:>10,} {gzip_size:>9,} {br_size:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Prescription search and medicine autocomplete benchmark.
+
+Seeds a separate database (default ehealth_bench) with --count prescriptions
+spread over 1,000 doctors, builds the app's indexes with init_db(), then times
+the search and suggest handlers against the p95 targets below. Exits with
+status 1 when a target is missed or a search plan falls back to a COLLSCAN.
+Needs a real MongoDB, as the text index is not available in mocks.
+
+    MONGO_URI=mongodb://localhost:27017 python scripts/bench_prescription_search.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bson import ObjectId
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# p95 latency targets in milliseconds, at 1M prescriptions
+TARGETS_MS = {
+    "search text": 50,
+    "search medicine": 20,
+    "search date range": 20,
+    "search combined": 50,
+    "suggest": 1,
+}
+TRIE_BUILD_TARGET_S = 30
+
+DOCTORS = 1000
+MEDICINE_BASES = [
+    "Paracetamol", "Pantoprazole", "Amoxicillin", "Azithromycin", "Amlodipine",
+    "Atorvastatin", "Metformin", "Metoprolol", "Montelukast", "Cetirizine",
+    "Ciprofloxacin", "Clopidogrel", "Losartan", "Levothyroxine", "Omeprazole",
+    "Ondansetron", "Ibuprofen", "Insulin Glargine", "Salbutamol", "Sertraline",
+]
+STRENGTHS = ["2.5mg", "5mg", "10mg", "20mg", "40mg", "250mg", "500mg", "650mg"]
+DIAGNOSES = [
+    "Hypertension", "Type 2 diabetes", "Acute bronchitis", "Migraine", "Gastritis",
+    "Hypothyroidism", "Allergic rhinitis", "Urinary tract infection", "Asthma",
+    "Viral fever", "Lower back pain", "Anxiety disorder", "Dyslipidemia",
+]
+NOTE_WORDS = [
+    "review", "after", "two", "weeks", "avoid", "spicy", "food", "hydrate", "rest",
+    "monitor", "blood", "pressure", "sugar", "levels", "follow", "up", "if", "symptoms",
+    "persist", "take", "with", "meals", "report", "dizziness", "fever",
+]
+
+
+def seed(prescriptions_col, count: int, rng: random.Random):
+    doctor_ids = [ObjectId() for _ in range(DOCTORS)]
+    medicines = [f"{base} {strength}" for base in MEDICINE_BASES for strength in STRENGTHS]
+    start = datetime(2024, 1, 1)
+
+    batch = []
+    for i in range(count):
+        names = rng.sample(medicines, rng.randint(1, 4))
+        batch.append({
+            "patientId": ObjectId(),
+            "doctorId": rng.choice(doctor_ids),
+            "hospitalId": f"H{rng.randint(1, 50)}",
+            "appointmentId": ObjectId(),
+            "diagnosis": rng.choice(DIAGNOSES),
+            "medicines": [
+                {"name": n, "dosage": "1 tab", "frequency": "BD", "duration": "5d", "nameLower": n.lower()}
+                for n in names
+            ],
+            "notes": " ".join(rng.choices(NOTE_WORDS, k=8)),
+            "createdAt": start + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60)),
+            "hash": f"{i:064x}",
+        })
+        if len(batch) == 10000:
+            prescriptions_col.insert_many(batch, ordered=False)
+            batch = []
+            print(f"  seeded {i + 1:,}/{count:,}", end="\r", flush=True)
+    if batch:
+        prescriptions_col.insert_many(batch, ordered=False)
+    print()
+
+
+def p95(samples) -> float:
+    ordered = sorted(samples)
+    return ordered[int(len(ordered) * 0.95) - 1]
+
+
+def timed(fn, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--db", default="ehealth_bench")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--reseed", action="store_true")
+    args = parser.parse_args()
+
+    # Must be set before db.py is imported; auditing would only add noise here
+    os.environ["MONGO_DB"] = args.db
+    os.environ["AUDIT_ENABLED"] = "false"
+
+    from db import init_db, prescriptions_col
+    from medicine_trie import medicine_trie
+    from routes.prescriptions import search_doctor_prescriptions, suggest_medicines
+
+    if args.reseed:
+        prescriptions_col.drop()
+    existing = prescriptions_col.estimated_document_count()
+    if existing < args.count:
+        print(f"Seeding {args.count - existing:,} prescriptions into {args.db}...")
+        seed(prescriptions_col, args.count - existing, random.Random(42))
+
+    init_db()
+
+    rng = random.Random(7)
+    doctors = prescriptions_col.distinct("doctorId")
+    from_date = datetime(2025, 3, 1)
+    to_date = datetime(2025, 4, 1)
+
+    def search(**filters):
+        params = {"q": None, "medicine": None, "from_date": None, "to_date": None, **filters}
+        user = {"user_id": str(rng.choice(doctors)), "role": "DOCTOR"}
+        return lambda: search_doctor_prescriptions(limit=50, fields=None, user=user, **params)
+
+    cases = {
+        "search text": lambda: search(q=rng.choice(DIAGNOSES).split()[0])(),
+        "search medicine": lambda: search(medicine=rng.choice(MEDICINE_BASES)[:4].lower())(),
+        "search date range": lambda: search(from_date=from_date, to_date=to_date)(),
+        "search combined": lambda: search(
+            q="hypertension", medicine="amlo", from_date=from_date, to_date=to_date
+        )(),
+    }
+
+    failed = False
+
+    # Every search shape must be served from an index
+    plans = {
+        "search text": {"$text": {"$search": "migraine"}},
+        "search medicine": {"medicines.nameLower": {"$regex": "^para"}},
+        "search date range": {"createdAt": {"$gte": from_date, "$lte": to_date}},
+    }
+    for name, extra in plans.items():
+        plan = str(prescriptions_col.find({"doctorId": doctors[0], **extra}).explain()["queryPlanner"])
+        if "COLLSCAN" in plan:
+            print(f"FAIL: {name} uses a collection scan")
+            failed = True
+
+    started = time.perf_counter()
+    medicine_trie.ensure_loaded()
+    build_s = time.perf_counter() - started
+    print(f"{'trie build':<18} {build_s:8.2f} s     (target {TRIE_BUILD_TARGET_S} s)")
+    failed |= build_s > TRIE_BUILD_TARGET_S
+
+    cases["suggest"] = lambda: suggest_medicines(
+        prefix=rng.choice(MEDICINE_BASES)[:rng.randint(1, 4)], limit=10, user={}
+    )
+
+    for name, fn in cases.items():
+        samples = timed(fn, args.runs)
+        result = p95(samples)
+        ok = result <= TARGETS_MS[name]
+        failed |= not ok
+        print(f"{name:<18} p50 {sorted(samples)[len(samples) // 2]:7.2f} ms  "
+              f"p95 {result:7.2f} ms  (target {TARGETS_MS[name]} ms) {'OK' if ok else 'FAIL'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
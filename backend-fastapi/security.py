@@ -1,7 +1,8 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from auth import SECRET_KEY, ALGORITHM
+from audit import audit_log
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
@@ -31,36 +32,40 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         )
 
 
-def patient_guard(user=Depends(get_current_user)):
+def patient_guard(request: Request, user=Depends(get_current_user)):
     try:
         if user.get("role") != "PATIENT":
+            audit_log.record(user, "ACCESS_DENIED", request.url.path)
             raise HTTPException(status_code=403, detail="Patient access only")
         return user
     except Exception as e:
         raise HTTPException(status_code=403, detail=str(e))
 
 
-def doctor_guard(user=Depends(get_current_user)):
+def doctor_guard(request: Request, user=Depends(get_current_user)):
     try:
         if user.get("role") != "DOCTOR":
+            audit_log.record(user, "ACCESS_DENIED", request.url.path)
             raise HTTPException(status_code=403, detail="Doctor access only")
         return user
     except Exception as e:
         raise HTTPException(status_code=403, detail=str(e))
 
 
-def hospital_admin_guard(user=Depends(get_current_user)):
+def hospital_admin_guard(request: Request, user=Depends(get_current_user)):
     try:
         if user.get("role") != "HOSPITAL_ADMIN":
+            audit_log.record(user, "ACCESS_DENIED", request.url.path)
             raise HTTPException(status_code=403, detail="Hospital Admin access only")
         return user
     except Exception as e:
         raise HTTPException(status_code=403, detail=str(e))
 
 
-def system_admin_guard(user=Depends(get_current_user)):
+def system_admin_guard(request: Request, user=Depends(get_current_user)):
     try:
         if user.get("role") != "SYSTEM_ADMIN":
+            audit_log.record(user, "ACCESS_DENIED", request.url.path)
             raise HTTPException(status_code=403, detail="System Admin access only")
         return user
     except Exception as e:
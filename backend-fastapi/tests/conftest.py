@@ -0,0 +1,91 @@
+import os
+
+import mongomock
+import pymongo.mongo_client
+
+# Swap the driver before db.py builds its client, so the app runs against an in-memory Mongo
+pymongo.mongo_client.MongoClient = mongomock.MongoClient
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+import pytest
+from bson import ObjectId
+from datetime import datetime
+from fastapi.testclient import TestClient
+
+import db
+import idempotency
+from medicine_trie import medicine_trie
+from auth import create_access_token
+from main import app
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    # delete_many keeps the indexes created by init_db()
+    for name in db.db.list_collection_names():
+        db.db[name].delete_many({})
+    idempotency._cache.clear()
+    medicine_trie.__init__()
+    yield
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        # Suggestions stay empty until the background trie build finishes
+        medicine_trie.wait(5)
+        yield c
+
+
+def auth_header(user_id, role: str) -> dict:
+    token = create_access_token({"user_id": str(user_id), "role": role, "name": role.title()})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def seed():
+    """One hospital, an approved doctor, a patient and an accepted appointment between them"""
+    db.hospitals_col.insert_one({
+        "hospitalId": "H1",
+        "hospitalName": "City Hospital",
+        "city": "Pune",
+        "state": "MH",
+        "location": {"type": "Point", "coordinates": [73.85, 18.52]}
+    })
+    doctor_id = db.users_col.insert_one({
+        "name": "Dr Rao",
+        "email": "rao@example.com",
+        "phone": "1",
+        "passwordHash": "x",
+        "role": "DOCTOR",
+        "status": "APPROVED",
+        "specialization": "Cardiology",
+        "licenseNumber": "L-1",
+        "hospitalId": "H1",
+        "latitude": 18.52,
+        "longitude": 73.85,
+        "location": {"type": "Point", "coordinates": [73.85, 18.52]}
+    }).inserted_id
+    patient_id = db.users_col.insert_one({
+        "name": "Asha",
+        "email": "asha@example.com",
+        "passwordHash": "x",
+        "role": "PATIENT"
+    }).inserted_id
+    appointment_id = db.appointments_col.insert_one({
+        "patientId": patient_id,
+        "doctorId": doctor_id,
+        "hospitalId": "H1",
+        "slot": datetime(2026, 1, 5, 10, 0),
+        "status": "ACCEPTED",
+        "createdAt": datetime(2026, 1, 1)
+    }).inserted_id
+
+    return {
+        "doctor_id": doctor_id,
+        "patient_id": patient_id,
+        "appointment_id": appointment_id,
+        "doctor": auth_header(doctor_id, "DOCTOR"),
+        "patient": auth_header(patient_id, "PATIENT"),
+        "unknown_id": ObjectId(),
+    }
@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import routes.hospitals
+from tests.conftest import auth_header
+
+LIST_DELAY = 0.5
+
+
+class SlowHospitals:
+    """Stands in for a Mongo that has slowed down on the directory listing"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        time.sleep(LIST_DELAY)
+        return self.collection.find(*args, **kwargs)
+
+
+def book(client, seed, hour: int) -> float:
+    started = time.perf_counter()
+    response = client.post(
+        "/appointments/request",
+        json={"doctorId": str(seed["doctor_id"]), "hospitalId": "H1", "slot": f"2026-03-01T{hour:02d}:00:00Z"},
+        headers=seed["patient"]
+    )
+    assert response.status_code == 200
+    return time.perf_counter() - started
+
+
+def test_booking_latency_stays_flat_while_listings_are_flooded(client, seed, monkeypatch):
+    monkeypatch.setattr(routes.hospitals, "hospitals_col", SlowHospitals(routes.hospitals.hospitals_col))
+
+    baseline = max(book(client, seed, hour) for hour in range(3))
+
+    with ThreadPoolExecutor(max_workers=120) as pool:
+        flood = [pool.submit(client.get, "/hospitals/") for _ in range(120)]
+        under_load = []
+        for hour in range(3, 8):
+            time.sleep(0.1)  # spread bookings across the flood
+            under_load.append(book(client, seed, hour))
+        listings = [f.result() for f in flood]
+
+    shed = [r for r in listings if r.status_code == 503]
+
+    # Bulk listings are capped at a slice of the threadpool, so bookings never wait behind them
+    assert max(under_load) < baseline + LIST_DELAY / 4
+    assert shed and all(r.headers["Retry-After"] for r in shed)
+    assert any(r.status_code == 200 for r in listings)
+
+
+def test_queue_wait_is_reported(client, seed):
+    response = client.get("/hospitals/")
+
+    assert response.headers["server-timing"].startswith("queue;dur=")
+
+
+def test_admission_metrics_require_system_admin(client, seed):
+    assert client.get("/metrics/admission").status_code == 401
+    assert client.get("/metrics/admission", headers=seed["patient"]).status_code == 403
+
+    response = client.get("/metrics/admission", headers=auth_header("admin", "SYSTEM_ADMIN"))
+
+    assert response.status_code == 200
+    assert set(response.json()["classes"]) == {"critical", "standard", "bulk"}
@@ -0,0 +1,85 @@
+import mongomock
+from fastapi.testclient import TestClient
+from pymongo.errors import AutoReconnect
+
+import db
+from audit import AuditLog
+from main import app
+from tests.conftest import auth_header
+
+
+class WritesThenFails:
+    """Stores the batch, then reports a network error, like a reply lost after the write"""
+
+    def __init__(self, collection, failures=1):
+        self.collection = collection
+        self.failures = failures
+
+    def insert_many(self, docs, ordered=True):
+        self.collection.insert_many(docs, ordered=ordered)
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("connection reset while reading reply from 10.0.0.5")
+
+
+def audit_log(collection):
+    log = AuditLog(collection, batch_size=10)
+    for i in range(3):
+        log.record({"user_id": "d1", "role": "DOCTOR"}, "READ", "prescriptions", [f"patient-{i}"])
+    return log
+
+
+def test_retry_after_lost_reply_stores_each_event_once(capsys):
+    collection = mongomock.MongoClient().audit.events
+    log = audit_log(WritesThenFails(collection))
+
+    assert not log._flush(log._take_batch())
+    assert len(log._buffer) == 3
+
+    assert log._flush(log._take_batch())
+    assert collection.count_documents({}) == 3
+    assert log.snapshot()["flushed"] == 3
+    assert log.snapshot()["failedFlushes"] == 1
+
+    # Only the error code and event count are logged, never document values
+    out = capsys.readouterr().out
+    assert "code=AutoReconnect events=3" in out
+    assert "10.0.0.5" not in out and "patient-" not in out
+
+
+def test_duplicate_events_count_as_flushed():
+    collection = mongomock.MongoClient().audit.events
+    log = audit_log(collection)
+    batch = log._take_batch()
+    collection.insert_one(dict(batch[0]))
+
+    assert log._flush(batch)
+    assert collection.count_documents({}) == 3
+    assert log.snapshot()["flushed"] == 3
+    assert not log._buffer
+
+
+def test_denied_access_is_recorded(seed):
+    # Leaving the client runs shutdown, which drains the buffer
+    with TestClient(app) as client:
+        assert client.get("/prescriptions/doctor", headers=seed["patient"]).status_code == 403
+
+    event = db.audit_col.find_one({"action": "ACCESS_DENIED"})
+    assert event["actorId"] == str(seed["patient_id"])
+    assert event["resource"] == "/prescriptions/doctor"
+
+
+def test_public_doctor_lookup_is_not_audited(seed):
+    with TestClient(app) as client:
+        assert client.get(f"/users/doctor/{seed['doctor_id']}").status_code == 200
+
+    assert db.audit_col.count_documents({}) == 0
+
+
+def test_audit_metrics_require_system_admin(client, seed):
+    assert client.get("/metrics/audit").status_code == 401
+    assert client.get("/metrics/audit", headers=seed["patient"]).status_code == 403
+
+    response = client.get("/metrics/audit", headers=auth_header(seed["unknown_id"], "SYSTEM_ADMIN"))
+    assert response.status_code == 200
+    assert {"buffered", "flushed", "dropped"} <= response.json().keys()
@@ -0,0 +1,100 @@
+import pytest
+
+import db
+from compression import choose_encoding
+from fieldsets import model_fields
+from tests.conftest import auth_header
+from models import (
+    HospitalSummary, HospitalDoctorEntry, DoctorDirectoryEntry, PatientAppointment, DoctorAppointment,
+    PatientPrescription, DoctorPrescriptionSummary
+)
+
+
+@pytest.fixture
+def prescription(client, seed):
+    response = client.post(
+        "/prescriptions/doctor",
+        json={
+            "patientId": str(seed["patient_id"]),
+            "appointmentId": str(seed["appointment_id"]),
+            "diagnosis": "Hypertension",
+            "medicines": [{"name": "Amlodipine", "dosage": "5mg", "frequency": "OD", "duration": "30d"}],
+            "notes": "Review in a month"
+        },
+        headers=seed["doctor"]
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path, role, model", [
+    ("/hospitals/", None, HospitalSummary),
+    ("/appointments/hospitals/H1/doctors", None, DoctorDirectoryEntry),
+    ("/appointments/patient", "patient", PatientAppointment),
+    ("/appointments/doctor/my-appointments", "doctor", DoctorAppointment),
+    ("/prescriptions/patient", "patient", PatientPrescription),
+    ("/prescriptions/doctor", "doctor", DoctorPrescriptionSummary),
+])
+def test_default_fields_follow_response_model(client, seed, prescription, path, role, model):
+    response = client.get(path, headers=seed[role] if role else {})
+
+    assert response.status_code == 200
+    rows = response.json()
+    assert rows and all(set(row) == set(model_fields(model)) for row in rows)
+    model.model_validate(rows[0])
+
+
+def test_sparse_fields_are_pushed_down(client, seed):
+    rows = client.get("/appointments/hospitals/H1/doctors?fields=name,location").json()
+
+    assert rows == [{"name": "Dr Rao", "location": {"type": "Point", "coordinates": [73.85, 18.52]}}]
+
+
+def test_unknown_field_is_rejected(client, seed):
+    response = client.get("/appointments/hospitals/H1/doctors?fields=name,passwordHash")
+
+    assert response.status_code == 400
+    assert "passwordHash" in response.json()["detail"]
+
+
+def test_large_responses_are_compressed(client, seed):
+    db.hospitals_col.insert_many([
+        {"hospitalId": f"H{i}", "hospitalName": f"Hospital {i}", "city": "Pune"} for i in range(2, 100)
+    ])
+
+    for encoding in ("br", "gzip"):
+        response = client.get("/hospitals/", headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert len(response.json()) == 99
+
+    assert "content-encoding" not in client.get("/hospitals/", headers={"Accept-Encoding": "identity"}).headers
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("br, gzip", "br"),
+    ("gzip, br;q=0", "gzip"),
+    ("br;q=0.0, gzip", "gzip"),
+    ("gzip;q=0.000, br;q=0", None),
+    ("br;q=0.5, gzip;q=1", "br"),
+    ("*", "br"),
+    ("*;q=0, gzip", "gzip"),
+    ("br;q=0, *", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding_honours_zero_q(header, expected):
+    assert choose_encoding({"headers": [(b"accept-encoding", header.encode())]}) == expected
+
+
+def test_small_responses_are_not_compressed(client, seed):
+    response = client.get("/hospitals/", headers={"Accept-Encoding": "br, gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_hospital_admin_doctor_list_follows_response_model(client, seed):
+    admin_id = db.users_col.insert_one({"name": "Admin", "role": "HOSPITAL_ADMIN", "hospitalId": "H1"}).inserted_id
+    db.users_col.update_one({"_id": seed["doctor_id"]}, {"$set": {"createdAt": "2026-01-01T00:00:00"}})
+
+    rows = client.get("/hospital-admin/doctors", headers=auth_header(admin_id, "HOSPITAL_ADMIN")).json()
+
+    assert [set(row) for row in rows] == [set(model_fields(HospitalDoctorEntry))]
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import db
+import idempotency
+from models import AppointmentRequest
+
+
+def booking(seed, hour=9):
+    return {"doctorId": str(seed["doctor_id"]), "hospitalId": "H1", "slot": f"2026-02-01T0{hour}:00:00Z"}
+
+
+def prescription(seed, diagnosis="Hypertension"):
+    return {
+        "patientId": str(seed["patient_id"]),
+        "appointmentId": str(seed["appointment_id"]),
+        "diagnosis": diagnosis,
+        "medicines": [{"name": "Amlodipine", "dosage": "5mg", "frequency": "OD", "duration": "30d"}],
+        "notes": ""
+    }
+
+
+def test_retry_storm_books_once(client, seed):
+    headers = {**seed["patient"], "Idempotency-Key": "storm-1"}
+
+    def post(_):
+        return client.post("/appointments/request", json=booking(seed), headers=headers)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(post, range(64)))
+
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.text for r in responses}) == 1
+    assert db.appointments_col.count_documents({}) == 2  # seeded + one booking
+
+
+def test_prescription_retries_replay_stored_hash(client, seed):
+    headers = {**seed["doctor"], "Idempotency-Key": "rx-1"}
+
+    hashes = [
+        client.post("/prescriptions/doctor", json=prescription(seed), headers=headers).json()["hash"]
+        for _ in range(3)
+    ]
+
+    assert len(set(hashes)) == 1
+    assert db.prescriptions_col.count_documents({}) == 1
+
+
+def test_key_reuse_with_different_body_is_rejected(client, seed):
+    headers = {**seed["doctor"], "Idempotency-Key": "rx-2"}
+
+    assert client.post("/prescriptions/doctor", json=prescription(seed), headers=headers).status_code == 200
+    response = client.post("/prescriptions/doctor", json=prescription(seed, "Asthma"), headers=headers)
+
+    assert response.status_code == 422
+    assert db.prescriptions_col.count_documents({}) == 1
+
+
+def test_failed_request_is_not_stored(client, seed):
+    body = {**booking(seed), "doctorId": str(seed["unknown_id"])}
+    headers = {**seed["patient"], "Idempotency-Key": "missing-doctor"}
+
+    assert client.post("/appointments/request", json=body, headers=headers).status_code == 404
+    assert db.idempotency_col.count_documents({}) == 0
+
+
+def _claim_for(seed, key: str, locked_until: datetime):
+    db.idempotency_col.insert_one({
+        "_id": f"appointments:{seed['patient_id']}:{key}",
+        "status": "IN_PROGRESS",
+        "fingerprint": idempotency._fingerprint(AppointmentRequest(**booking(seed))),
+        "lockedUntil": locked_until,
+        "createdAt": datetime.utcnow()
+    })
+
+
+def test_live_claim_from_another_worker_conflicts(client, seed):
+    _claim_for(seed, "live", datetime.utcnow() + timedelta(seconds=30))
+    headers = {**seed["patient"], "Idempotency-Key": "live"}
+
+    assert client.post("/appointments/request", json=booking(seed), headers=headers).status_code == 409
+
+
+def test_stale_claim_is_taken_over(client, seed):
+    _claim_for(seed, "stale", datetime.utcnow() - timedelta(seconds=1))
+    headers = {**seed["patient"], "Idempotency-Key": "stale"}
+
+    response = client.post("/appointments/request", json=booking(seed), headers=headers)
+
+    assert response.status_code == 200
+    stored = db.idempotency_col.find_one({"_id": f"appointments:{seed['patient_id']}:stale"})
+    assert stored["status"] == "COMPLETED"
@@ -0,0 +1,110 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+import db
+import medicine_trie as trie_module
+from main import app
+from medicine_trie import MedicineTrie, medicine_trie
+
+
+def prescribe(client, seed, diagnosis: str, *medicines: str):
+    response = client.post(
+        "/prescriptions/doctor",
+        json={
+            "patientId": str(seed["patient_id"]),
+            "appointmentId": str(seed["appointment_id"]),
+            "diagnosis": diagnosis,
+            "medicines": [
+                {"name": name, "dosage": "1 tab", "frequency": "BD", "duration": "5d"}
+                for name in medicines
+            ],
+            "notes": ""
+        },
+        headers=seed["doctor"]
+    )
+    assert response.status_code == 200
+
+
+def test_medicine_search_is_case_insensitive(client, seed):
+    prescribe(client, seed, "Viral fever", "Paracetamol 650mg")
+    prescribe(client, seed, "Gastritis", "Pantoprazole 40mg")
+
+    for term in ("Para", "para", "PARACETAMOL"):
+        results = client.get(f"/prescriptions/doctor/search?medicine={term}", headers=seed["doctor"]).json()
+        assert [r["diagnosis"] for r in results] == ["Viral fever"]
+
+
+def test_stored_search_key_is_not_returned(client, seed):
+    prescribe(client, seed, "Viral fever", "Paracetamol 650mg")
+
+    listed = client.get("/prescriptions/patient", headers=seed["patient"]).json()
+
+    assert db.prescriptions_col.find_one()["medicines"][0]["nameLower"] == "paracetamol 650mg"
+    assert listed[0]["medicines"] == [
+        {"name": "Paracetamol 650mg", "dosage": "1 tab", "frequency": "BD", "duration": "5d"}
+    ]
+
+
+def test_search_by_date_range(client, seed):
+    prescribe(client, seed, "Viral fever", "Paracetamol 650mg")
+
+    found = client.get("/prescriptions/doctor/search?from=2020-01-01T00:00:00Z", headers=seed["doctor"])
+    missed = client.get("/prescriptions/doctor/search?to=2020-01-01T00:00:00Z", headers=seed["doctor"])
+
+    assert len(found.json()) == 1
+    assert missed.json() == []
+
+
+def test_suggestions_rank_by_frequency_and_update_on_insert(client, seed):
+    prescribe(client, seed, "Gastritis", "Pantoprazole 40mg")
+    suggested = client.get("/prescriptions/medicines/suggest?prefix=pa", headers=seed["doctor"]).json()
+    assert [s["name"] for s in suggested] == ["Pantoprazole 40mg"]
+
+    prescribe(client, seed, "Viral fever", "Paracetamol 650mg")
+    prescribe(client, seed, "Migraine", "paracetamol 650mg")
+    suggested = client.get("/prescriptions/medicines/suggest?prefix=PA", headers=seed["doctor"]).json()
+
+    assert suggested == [
+        {"name": "Paracetamol 650mg", "count": 2},
+        {"name": "Pantoprazole 40mg", "count": 1},
+    ]
+
+
+class SlowAggregate:
+    """Holds the trie build's aggregation until released"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.release = threading.Event()
+
+    def aggregate(self, pipeline):
+        self.release.wait(5)
+        return self.collection.aggregate(pipeline)
+
+
+def test_trie_builds_in_background_without_blocking_requests(monkeypatch, seed):
+    slow = SlowAggregate(db.prescriptions_col)
+    monkeypatch.setattr(trie_module, "prescriptions_col", slow)
+
+    with TestClient(app) as client:
+        # Startup and suggest return while the build is still running
+        assert client.get("/prescriptions/medicines/suggest?prefix=pa", headers=seed["doctor"]).json() == []
+        prescribe(client, seed, "Gastritis", "Pantoprazole 40mg")
+
+        slow.release.set()
+        assert medicine_trie.wait(5)
+        suggested = client.get("/prescriptions/medicines/suggest?prefix=pa", headers=seed["doctor"]).json()
+
+    # Inserted before the build read the collection, so the queued insert counts it again
+    assert suggested == [{"name": "Pantoprazole 40mg", "count": 2}]
+
+
+def test_inserts_during_build_are_applied_once_loaded():
+    trie = MedicineTrie()
+    trie.add("Paracetamol 650mg")
+    assert trie.suggest("para") == []
+
+    trie.ensure_loaded()
+
+    assert trie.suggest("para") == [{"name": "Paracetamol 650mg", "count": 1}]
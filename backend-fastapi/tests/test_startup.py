@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def run(*args, **env):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "JWT_SECRET": "test-secret", **env}
+    )
+
+
+def test_import_does_no_database_io():
+    # An unresolvable SRV URI fails on the first DNS lookup, so this only passes without import-time I/O
+    result = run("-c", "import main", MONGO_URI="mongodb+srv://unresolvable.invalid/")
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_import_time_is_within_budget():
+    result = run("scripts/check_import_time.py", "--runs", "3", "--top", "0")
+
+    assert result.returncode == 0, result.stdout + result.stderr